@@ -1,20 +1,52 @@
-from json import loads  # noqa: CPY001, D100
+import os  # noqa: CPY001, D100
+from concurrent.futures import ProcessPoolExecutor
+from json import loads
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
 from backend.python.services.enriching_service import main as enrich_team_data
 from backend.python.services.parser import load_team_data
 
 
-def save_team_data(team_name: str, *, data_path: str = "data/csv", json_data_path: str = "data/") -> None:
-    """Load and save the HTML data for a given team.
+def save_team_data(
+    team_name: str, *, dataset_path: str = "data/teams.parquet", json_data_path: str = "data/",
+) -> None:
+    """Load the HTML data for a given team and save it as its partition of the teams Parquet dataset.
 
     Args:
         team_name (str): Name of the team.
-        data_path (str, optional): Path to the directory to save CSV files. Defaults to "data/csv".
+        dataset_path (str, optional): Root of the Parquet dataset, partitioned by `team`.
+            Defaults to "data/teams.parquet".
         json_data_path (str, optional): Path to the directory containing HTML files. Defaults to "data/html".
     """
     df = load_team_data(team_name, data_path=json_data_path)
-    df.to_csv(f"{data_path.removesuffix('/')}/{team_name}.csv", index=False)
+
+    # Replaces any previous partition for this team, leaving the other teams' untouched
+    pq.write_to_dataset(
+        pa.Table.from_pandas(df.assign(team=team_name), preserve_index=False),
+        root_path=dataset_path,
+        partition_cols=["team"],
+        existing_data_behavior="delete_matching",
+        # A fixed file name keeps reruns from piling up files under new random names
+        basename_template="part-{i}.parquet",
+        compression="zstd",
+    )
+
+
+def _process_team(team: str) -> str:
+    """Save the data for a single team; top-level so it can be pickled into worker processes.
+
+    Args:
+        team (str): Name of the team.
+
+    Returns:
+        str: The processed team's name.
+    """
+    save_team_data(team_name=team)
+    return team
 
 
 def main() -> None:
@@ -22,9 +54,10 @@ def main() -> None:
     with Path("data/teams.json").open(encoding="utf8") as f:
         teams = loads(f.read())
 
-    for team in teams:
-        save_team_data(team_name=team)
-        print(f"Saved data for team: {team}")  # noqa: T201
+    # Each team is parsed and written independently, so fan them out across processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for team in tqdm(executor.map(_process_team, teams), total=len(teams)):
+            print(f"Saved data for team: {team}")  # noqa: T201
 
     enrich_team_data()
 
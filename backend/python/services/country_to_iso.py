@@ -1,4 +1,5 @@
-from functools import lru_cache  # noqa: CPY001, D100
+from concurrent.futures import ThreadPoolExecutor  # noqa: CPY001, D100
+from functools import lru_cache
 
 import requests
 
@@ -118,15 +119,14 @@ def get_country_isos(country_candidates: set[str]) -> dict[str, str | None]:
     Returns:
         Dictionary mapping each candidate to its ISO code (or None if not found)
     """
-    results = {}
-    failed_candidates = []
-
-    # First pass: try to get each country individually
-    for candidate in country_candidates:
-        iso_code = get_country_iso(candidate)
-        results[candidate] = iso_code
-        if iso_code is None:
-            failed_candidates.append(candidate)
+    candidates = list(country_candidates)
+
+    # First pass: try to get each country individually. The lookups are network-bound,
+    # so run them on a thread pool.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = dict(zip(candidates, executor.map(get_country_iso, candidates), strict=True))
+
+    failed_candidates = [candidate for candidate, iso_code in results.items() if iso_code is None]
 
     # Second pass: for failed candidates, try matching against all countries
     if failed_candidates:
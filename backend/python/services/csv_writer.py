@@ -0,0 +1,25 @@
+import pathlib  # noqa: CPY001, D100
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# Rows per batch handed to Arrow's CSV writer
+BATCH_SIZE = 8192
+
+
+def write_csv(df: pd.DataFrame, path: str | pathlib.Path) -> None:
+    """
+    Writes a DataFrame to CSV with Arrow's multithreaded writer instead of `DataFrame.to_csv`.
+
+    The index is not written. Object columns must hold scalars Arrow can type (strings, numbers, missing values).
+
+    Args:
+        df (pd.DataFrame): The data to write.
+        path (str | pathlib.Path): Destination CSV file.
+    """
+    pacsv.write_csv(
+        pa.Table.from_pandas(df, preserve_index=False),
+        str(path),
+        write_options=pacsv.WriteOptions(include_header=True, batch_size=BATCH_SIZE),
+    )
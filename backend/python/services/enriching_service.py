@@ -1,38 +1,259 @@
 import json  # noqa: CPY001, D100
+import os
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from multiprocessing.shared_memory import SharedMemory
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import unidecode
+from tqdm import tqdm
 
 from backend.python.services.country_to_iso import get_country_isos
+from backend.python.services.csv_writer import write_csv
 
+# Columns of the NBA player data used when enriching a team
+NBA_COLUMNS = [
+    "nba_id",
+    "full_name",
+    "COUNTRY",
+    "TO_YEAR",
+    "IS_DEFUNCT",
+    "real_team",
+    "draft_key",
+    "name_key",
+]
 
-def treat_name(name: str) -> str:
+# Columns brought over from the matched NBA player
+MATCHED_COLUMNS = ["nba_id", "full_name", "COUNTRY", "TO_YEAR", "IS_DEFUNCT", "real_team"]
+
+# Per-worker state set up by `_init_worker`: the NBA data read from shared memory,
+# and the NBA row position for each draft key and name key category
+_nba_df: pd.DataFrame | None = None
+_nba_row_by_draft_code: np.ndarray | None = None
+_nba_row_by_name_code: np.ndarray | None = None
+
+# Combining diacritical marks left behind by NFKD decomposition (e.g. the caron in "š"). Kept as plain
+# pattern strings, with literal characters, so pandas hands them to Arrow's RE2 kernels instead of `re`.
+_COMBINING_MARKS_PATTERN = "[\u0300-\u036f]"
+_NON_ASCII_PATTERN = r"[^\x00-\x7f]"
+
+# Generational suffixes stripped from the end of player names
+_SUFFIX_PATTERN = r"\s+(?:Jr\.?|II|III|IV)$"
+
+
+@cache
+def _transliterate(name: str) -> str:
+    """
+    Memoized `unidecode.unidecode`; the same players show up on several teams.
+
+    Args:
+        name (str): The name to transliterate.
+
+    Returns:
+        str: The ASCII transliteration of the name.
+    """
+    return unidecode.unidecode(name)
+
+
+def treat_names(names: pd.Series) -> pd.Series:
     """
-    Cleans and standardizes player names by removing suffixes and replacing certain abbreviations.
+    Cleans and standardizes player names.
+
+    Suffixes are removed, certain abbreviations replaced and the result transliterated to ASCII.
+    The names are cast to Arrow-backed strings so every step runs in Arrow's compiled string kernels
+    rather than one Python call per name. Accents are stripped with a single NFKD pass; only the few
+    names still holding non-ASCII letters afterwards (e.g. "Đ", "ø") go through `unidecode`.
 
     Args:
-        name (str): The original player name.
+        names (pd.Series): The original player names.
 
     Returns:
-        str: The cleaned and standardized player name.
-    """
-    return (
-        name.removesuffix(" Jr")
-        .removesuffix(" Jr.")
-        .replace("Cam", "Cameron")
-        .replace("Moe", "Moritz")
-        .removesuffix(" II")
-        .removesuffix(" III")
-        .removesuffix(" IV")
-        .replace("'", "")
-        .replace(".", "")
-        .replace(",", "")
-        .replace("-", " ")
-        .replace("  ", " ")
-        .strip()
+        pd.Series: The cleaned, standardized and ASCII-only player names.
+    """
+    treated = (
+        names.astype("string[pyarrow]")
+        .str.replace(_SUFFIX_PATTERN, "", regex=True)
+        .str.replace("Cam", "Cameron", regex=False)
+        .str.replace("Moe", "Moritz", regex=False)
+        .str.replace("-", " ", regex=False)
+        .str.replace("['.,]", "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .str.normalize("NFKD")
+        .str.replace(_COMBINING_MARKS_PATTERN, "", regex=True)
     )
 
+    non_ascii = treated.str.contains(_NON_ASCII_PATTERN, regex=True, na=False)
+    treated[non_ascii] = treated[non_ascii].map(_transliterate)
+
+    return treated
+
+
+def _join_keys(*columns: pd.Series) -> pd.Series:
+    """
+    Builds a `|`-separated lookup key from the given columns.
+
+    Numeric columns are formatted as integers so that e.g. a float `DRAFT_YEAR` and an integer `Year` agree.
+
+    Args:
+        *columns (pd.Series): The columns making up the key.
+
+    Returns:
+        pd.Series: The keys; missing wherever any of the columns is missing.
+    """
+    parts = [
+        (column.astype("Int64") if pd.api.types.is_numeric_dtype(column) else column).astype("string")
+        for column in columns
+    ]
+
+    return parts[0].str.cat(parts[1:], sep="|")
+
+
+def _first_row_by_code(keys: pd.Series) -> np.ndarray:
+    """
+    Maps each category of a categorical key column to the position of the first row holding it.
+
+    Args:
+        keys (pd.Series): The categorical keys, one per row.
+
+    Returns:
+        np.ndarray: Row positions indexed by category code, -1 for categories no row holds.
+    """
+    codes = keys.cat.codes.to_numpy()
+    present = np.flatnonzero(codes >= 0)
+
+    # `return_index` gives the first occurrence of each code that actually appears
+    used_codes, first = np.unique(codes[present], return_index=True)
+
+    rows = np.full(len(keys.cat.categories), -1)
+    rows[used_codes] = present[first]
+
+    return rows
+
+
+def _lookup_rows(keys: pd.Series, nba_keys: pd.Series, nba_row_by_code: np.ndarray) -> np.ndarray:
+    """
+    Finds the NBA row matching each key by encoding the keys with the NBA keys' categories.
+
+    Args:
+        keys (pd.Series): The keys to look up.
+        nba_keys (pd.Series): The categorical NBA keys the lookup was built from.
+        nba_row_by_code (np.ndarray): Row positions indexed by category code, from `_first_row_by_code`.
+
+    Returns:
+        np.ndarray: The matching NBA row positions, -1 where no NBA row has the key.
+    """
+    codes = pd.Categorical(keys, categories=nba_keys.cat.categories).codes
+
+    return np.where(codes >= 0, nba_row_by_code[codes], -1)
+
+
+def _share_nba_df(nba_df: pd.DataFrame) -> SharedMemory:
+    """
+    Serializes the NBA player data as an Arrow IPC stream into a new shared memory block.
+
+    Args:
+        nba_df (pd.DataFrame): NBA player data restricted to `NBA_COLUMNS`, with a default index.
+
+    Returns:
+        SharedMemory: The block holding the stream; the caller is responsible for closing and unlinking it.
+    """
+    table = pa.Table.from_pandas(nba_df, preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    buffer = sink.getvalue()
+
+    shm = SharedMemory(create=True, size=buffer.size)
+    shm.buf[: buffer.size] = memoryview(buffer).cast("B")
+
+    return shm
+
+
+def _init_worker(shm_name: str) -> None:
+    """
+    Reads the NBA player data shared by the parent process, once per worker.
+
+    The stream is copied out of the block and the block is detached right away, so nothing in
+    the worker keeps exporting its buffer when the process exits.
+
+    Args:
+        shm_name (str): Name of the shared memory block created by `_share_nba_df`.
+    """
+    global _nba_df, _nba_row_by_draft_code, _nba_row_by_name_code  # noqa: PLW0603
+
+    # The parent owns the block, so keep this process's resource tracker from unlinking it
+    shm = SharedMemory(name=shm_name, track=False)
+
+    try:
+        stream = bytes(shm.buf)
+    finally:
+        shm.close()
+
+    _nba_df = pa.ipc.open_stream(pa.py_buffer(stream)).read_all().to_pandas()
+
+    # Some players share a draft slot in the NBA data; like a left merge followed by
+    # de-duplication, the first of them wins
+    _nba_row_by_draft_code = _first_row_by_code(_nba_df["draft_key"])
+    _nba_row_by_name_code = _first_row_by_code(_nba_df["name_key"])
+
+
+def _process_team(team: str) -> None:
+    """
+    Enriches a single team's draft picks with NBA player data and writes them to the frontend data folder.
+
+    Must run in a worker set up by `_init_worker`.
+
+    Args:
+        team (str): Abbreviation of the team to enrich.
+    """
+    # Read the team's own partition rather than filtering the whole dataset, which would cast every team
+    # to the schema of the first partition Arrow finds
+    curr_df = pq.read_table(f"data/teams.parquet/team={team}").to_pandas()
+
+    draft_keys = _join_keys(curr_df["Year"], curr_df["Round"], curr_df["Pick"])
+    name_keys = _join_keys(treat_names(curr_df["Player"]), curr_df["Year"])
+
+    # Match by Year/Round/Pick to DRAFT_YEAR/DRAFT_ROUND/DRAFT_NUMBER, falling back to name and year
+    nba_rows = _lookup_rows(draft_keys, _nba_df["draft_key"], _nba_row_by_draft_code)
+    nba_rows = np.where(nba_rows >= 0, nba_rows, _lookup_rows(name_keys, _nba_df["name_key"], _nba_row_by_name_code))
+
+    # Pull the matched players' data; unmatched rows (position -1) get all-missing values
+    matched_df = _nba_df[MATCHED_COLUMNS].reindex(nba_rows).set_axis(curr_df.index)
+    curr_df = pd.concat([curr_df, matched_df], axis=1)
+
+    # Prefer the nba `full_name` (original punctuation) when available; otherwise fall back to the CSV `Player` value
+    curr_df["full_name"] = curr_df["full_name"].where(curr_df["full_name"].notna(), curr_df["Player"])
+
+    # Make the final output keep the column name `Player` but use the NBA `full_name` when present
+    curr_df["Player"] = curr_df["full_name"]
+    curr_df = curr_df.drop(columns=["full_name"])
+
+    curr_df = curr_df.drop_duplicates(subset=["Year", "Round", "Pick"])
+
+    curr_df = curr_df.rename(
+        columns={
+            "COUNTRY": "origin_country",
+            "TO_YEAR": "played_until_year",
+            "IS_DEFUNCT": "is_defunct",
+            "real_team": "plays_for",
+        },
+    )
+
+    total_matched = curr_df["nba_id"].notna().sum()
+    total_players = len(curr_df)
+
+    print(
+        f"Team: {team} - Matched players: {total_matched}/{total_players} ({(total_matched / total_players) * 100:.2f}%)",
+    )
+
+    write_csv(curr_df, f"frontend/public/data/csv/{team}_enriched.csv")
+
 
 def main() -> None:  # noqa: D103
     with pathlib.Path("data/teams.json").open("r", encoding="utf-8") as f:
@@ -44,86 +265,39 @@ def main() -> None:  # noqa: D103
     # Join last_name and first_name into full_name
     nba_df["full_name"] = nba_df["first_name"] + " " + nba_df["last_name"]
 
-    # Treat names in the DataFrame
-    nba_df["treated_name"] = nba_df["full_name"].apply(treat_name).apply(unidecode.unidecode)
-
-    for team in teams:
-        curr_df = pd.read_csv(f"data/csv/{team}.csv")
-
-        curr_df["treated_name"] = curr_df["Player"].apply(treat_name).apply(unidecode.unidecode)
-
-        # First match by Year/Round/Pick to DRAFT_YEAR/DRAFT_ROUND/DRAFT_NUMBER
-        curr_df_merged = curr_df.merge(
-            nba_df[["nba_id", "full_name", "DRAFT_YEAR", "DRAFT_ROUND", "DRAFT_NUMBER", "COUNTRY", "TO_YEAR", "IS_DEFUNCT", "real_team"]],
-            left_on=["Year", "Round", "Pick"],
-            right_on=["DRAFT_YEAR", "DRAFT_ROUND", "DRAFT_NUMBER"],
-            how="left",
-            suffixes=("", "_draft"),
-        )
-
-        # For rows that didn't match (nba_id is NaN), try name matching as fallback
-        unmatched_mask = curr_df_merged["nba_id"].isna()
-
-        if unmatched_mask.any():
-            # Get unmatched rows
-            unmatched_df = curr_df_merged[unmatched_mask].copy()
-
-            # Drop the columns from the first merge attempt
-            unmatched_df = unmatched_df.drop(
-                columns=["nba_id", "DRAFT_YEAR", "DRAFT_ROUND", "DRAFT_NUMBER", "COUNTRY", "TO_YEAR", "IS_DEFUNCT", "real_team"],
-            )
-
-            # Try matching by name and year
-            unmatched_df = unmatched_df.merge(
-                nba_df[["nba_id", "full_name", "treated_name", "DRAFT_YEAR", "COUNTRY", "TO_YEAR", "IS_DEFUNCT", "real_team"]],
-                left_on=["treated_name", "Year"],
-                right_on=["treated_name", "DRAFT_YEAR"],
-                how="left",
-                suffixes=("", "_name"),
-            )
-
-            # Update the original merged dataframe with the name matches
-            curr_df_merged.loc[unmatched_mask, "nba_id"] = unmatched_df["nba_id"].to_numpy()
-            curr_df_merged.loc[unmatched_mask, "COUNTRY"] = unmatched_df["COUNTRY"].to_numpy()
-            curr_df_merged.loc[unmatched_mask, "TO_YEAR"] = unmatched_df["TO_YEAR"].to_numpy()
-            curr_df_merged.loc[unmatched_mask, "IS_DEFUNCT"] = unmatched_df["IS_DEFUNCT"].to_numpy()
-            curr_df_merged.loc[unmatched_mask, "real_team"] = unmatched_df["real_team"].to_numpy()
-            # Also pull the original, punctuated `full_name` from nba_df for matched rows
-            curr_df_merged.loc[unmatched_mask, "full_name"] = unmatched_df["full_name"].to_numpy()
-
-        # Clean up columns but keep `full_name` from nba_df when present
-        curr_df = curr_df_merged.drop(columns=["treated_name", "DRAFT_YEAR", "DRAFT_ROUND", "DRAFT_NUMBER"])
-
-        # Prefer the nba `full_name` (original punctuation) when available; otherwise fall back to the CSV `Player` value
-        curr_df["full_name"] = curr_df["full_name"].where(curr_df["full_name"].notna(), curr_df["Player"])
-
-        # Make the final output keep the column name `Player` but use the NBA `full_name` when present
-        curr_df["Player"] = curr_df["full_name"]
-        curr_df = curr_df.drop(columns=["full_name"])
-
-        curr_df = curr_df.drop_duplicates(subset=["Year", "Round", "Pick"])
-
-        curr_df = curr_df.rename(
-            columns={
-                "COUNTRY": "origin_country",
-                "TO_YEAR": "played_until_year",
-                "IS_DEFUNCT": "is_defunct",
-                "real_team": "plays_for",
-            },
-        )
-
-        country_names = set(curr_df["origin_country"].dropna().unique())
-        country_to_iso = get_country_isos(country_names)
-        curr_df["origin_country"] = curr_df["origin_country"].map(country_to_iso)
-
-        total_matched = curr_df["nba_id"].notna().sum()
-        total_players = len(curr_df)
-
-        print(
-            f"Team: {team} - Matched players: {total_matched}/{total_players} ({(total_matched / total_players) * 100:.2f}%)",
-        )
-
-        curr_df.to_csv(f"frontend/public/data/csv/{team}_enriched.csv", index=False)
+    # Precompute the keys each team is matched on: the draft slot, and the treated name with the draft year.
+    # As categoricals, team keys can be encoded against the same categories to find their rows by integer code.
+    nba_df["draft_key"] = _join_keys(
+        nba_df["DRAFT_YEAR"], nba_df["DRAFT_ROUND"], nba_df["DRAFT_NUMBER"],
+    ).astype("category")
+    nba_df["name_key"] = _join_keys(treat_names(nba_df["full_name"]), nba_df["DRAFT_YEAR"]).astype("category")
+
+    # Resolve country ISO codes once, up front, for every country in the NBA data (a superset of any team's)
+    country_to_iso = get_country_isos(set(nba_df["COUNTRY"].dropna().unique()))
+    nba_df["COUNTRY"] = nba_df["COUNTRY"].map(country_to_iso)
+
+    # Slim down the shared columns: compact nullable integers, and categoricals for the repetitive strings.
+    # COUNTRY is cast after the ISO mapping, which would otherwise turn it back into plain strings.
+    for column in ["nba_id", "TO_YEAR", "IS_DEFUNCT"]:
+        nba_df[column] = pd.to_numeric(nba_df[column], errors="coerce").astype("Int32")
+
+    for column in ["COUNTRY", "real_team"]:
+        nba_df[column] = nba_df[column].astype("category")
+
+    # Teams are independent of each other, so enrich them in parallel worker processes. The NBA data
+    # is handed over once through shared memory rather than pickled for every team.
+    shm = _share_nba_df(nba_df[NBA_COLUMNS])
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(shm.name,),
+        ) as executor:
+            list(tqdm(executor.map(_process_team, teams), total=len(teams)))
+    finally:
+        shm.close()
+        shm.unlink()
 
 
 if __name__ == "__main__":
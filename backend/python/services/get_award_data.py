@@ -1,12 +1,44 @@
-import json  # noqa: CPY001, D100
+import asyncio  # noqa: CPY001, D100
+import json
+import os
 import pathlib
-import time
-from collections import defaultdict
-from functools import cache
+import tempfile
+from collections import Counter
 
+import httpx
 import pandas as pd
-import requests
 from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
+
+from backend.python.services.csv_writer import write_csv
+
+AWARDS_URL = "https://stats.nba.com/stats/playerawards"
+
+# `Host` and `Connection` are left out on purpose: they are connection-specific
+# headers that HTTP/2 forbids, and httpx fills in the authority itself.
+HEADERS = {
+    "Accept": "*/*",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+    "Accept-Language": "en-US,en;q=0.7",
+    "Origin": "https://www.nba.com",
+    "Referer": "https://www.nba.com/",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-site",
+    "Sec-GPC": "1",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+    "sec-ch-ua": '"Chromium";v="142", "Brave";v="142", "Not_A Brand";v="99"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+}
+
+# Upper bound on award requests in flight at once, shared by all teams
+MAX_CONNECTIONS = 32
+
+# On-disk cache of award data by NBA ID, so players seen on several teams (or in
+# previous runs) are only fetched once. Only players with at least one award are
+# cached, so active players without one are checked again on every run.
+AWARDS_CACHE_PATH = pathlib.Path("data/awards_cache.json")
 
 
 def get_number_suffix(number: float) -> str:
@@ -25,47 +57,27 @@ def get_number_suffix(number: float) -> str:
     return {1: "st", 2: "nd", 3: "rd"}.get(int(number) % 10, "th")
 
 
-@cache  # pyright: ignore[reportUntypedFunctionDecorator]
-def get_award_data(player_nba_id: int) -> dict[str, int]:  # noqa: C901
+async def get_award_data(client: httpx.AsyncClient, player_nba_id: int) -> dict[str, int]:
     """
     Fetches award data for a given NBA player using their NBA ID.
 
     Args:
+        client (httpx.AsyncClient): The shared client used to query the NBA stats API.
         player_nba_id (int): The NBA ID of the player.
 
     Returns:
         dict: A dictionary containing the player's award data.
     """
-    base_url = "https://stats.nba.com/stats/playerawards?LeagueID=00&PerMode=PerGame&PlayerID={}"
-
-    payload = {}
-
-    headers = {
-        "Accept": "*/*",
-        "Accept-Encoding": "gzip, deflate, br, zstd",
-        "Accept-Language": "en-US,en;q=0.7",
-        "Connection": "keep-alive",
-        "Host": "stats.nba.com",
-        "Origin": "https://www.nba.com",
-        "Referer": "https://www.nba.com/",
-        "Sec-Fetch-Dest": "empty",
-        "Sec-Fetch-Mode": "cors",
-        "Sec-Fetch-Site": "same-site",
-        "Sec-GPC": "1",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-        "sec-ch-ua": '"Chromium";v="142", "Brave";v="142", "Not_A Brand";v="99"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Windows"',
-    }
+    params = {"LeagueID": "00", "PerMode": "PerGame", "PlayerID": player_nba_id}
 
     try:
-        data = requests.request("GET", base_url.format(player_nba_id), headers=headers, data=payload, timeout=10)
+        data = await client.get(AWARDS_URL, params=params)
         data.raise_for_status()
-    except requests.RequestException:
-        # If the request fails, wait 30 seconds and try once more.
+    except httpx.HTTPError:
+        # If the request fails, wait 60 seconds and try once more.
         print(f"Request for player ID {player_nba_id} failed, retrying...")
-        time.sleep(60)
-        data = requests.request("GET", base_url.format(player_nba_id), headers=headers, data=payload, timeout=10)
+        await asyncio.sleep(60)
+        data = await client.get(AWARDS_URL, params=params)
         data.raise_for_status()
 
     raw_data = data.json()
@@ -79,132 +91,271 @@ def get_award_data(player_nba_id: int) -> dict[str, int]:  # noqa: C901
     award_index = headers.index("DESCRIPTION")
     team_number_index = headers.index("ALL_NBA_TEAM_NUMBER")
 
-    output = defaultdict(int)
-
-    for item in data_list:
+    def _award_name(item: list) -> str:
         award_name = item[award_index]
         team_number = item[team_number_index]
 
         if team_number and team_number.isdigit():
-            award_name = f"{team_number}{get_number_suffix(int(team_number))} Team {award_name.removesuffix(" Team")}"
+            return f"{team_number}{get_number_suffix(int(team_number))} Team {award_name.removesuffix(" Team")}"
 
-        output[award_name] += 1
+        return award_name
 
-    return dict(output)
+    # Count every award in a single pass over the rows
+    return dict(Counter(map(_award_name, data_list)))
 
 
-def main(*, force: bool = False, force_all: bool = False) -> None:  # noqa: C901
-    """Main function to enrich player data with award information.
+def load_award_cache(path: pathlib.Path = AWARDS_CACHE_PATH) -> dict[int, dict[str, int]]:
+    """
+    Loads the on-disk award cache.
 
     Args:
-        force (bool): If True, fetch award data for all eligible players in a
-            team even if an `awards` value already exists for that player.
-            Defaults to False.
-        force_all (bool): If True, process teams even when the CSV already
-            contains an `awards` column. When False (default), teams that
-            already have an `awards` column are skipped entirely.
+        path (pathlib.Path): Path to the JSON cache file. Defaults to `AWARDS_CACHE_PATH`.
+
+    Returns:
+        dict: The cached award data by NBA ID, empty if the file does not exist yet.
     """
-    with pathlib.Path("data/teams.json").open("r", encoding="utf-8") as f:
-        teams = json.load(f)
+    if not path.exists():
+        return {}
 
-    for team in tqdm(teams):
-        curr_df = pd.read_csv(
-            f"frontend/public/data/csv/{team}_enriched.csv",  # pyright: ignore[reportUnknownMemberType]
-        )
+    with path.open("r", encoding="utf-8") as f:
+        return {int(nba_id): award_data for nba_id, award_data in json.load(f).items() if award_data}
 
-        # By default, skip teams that already have an `awards` column.
-        # `force_all=True` overrides and forces processing of such teams.
-        if "awards" in curr_df.columns and not force_all:
-            print(f"Skipping team {team} because 'awards' column exists (use force_all to override)")
-            continue
 
-        # Normalize types
-        nba_id_series = pd.to_numeric(curr_df["nba_id"], errors="coerce").astype("Int64")
-        yos_series = pd.to_numeric(curr_df["YOS"], errors="coerce").fillna(0).astype("Int64")
+def save_award_cache(cache: dict[int, dict[str, int]], path: pathlib.Path = AWARDS_CACHE_PATH) -> None:
+    """
+    Writes the award cache to disk.
 
-        # Determine which rows actually need award data fetched.
-        # If `force` is True, fetch for all eligible rows. Otherwise only
-        # fetch for rows where the `awards` column is empty/missing.
-        if "awards" in curr_df.columns and not force:
+    The cache is written to a temporary file next to `path` and then moved into place, so an
+    interrupted write never leaves a truncated cache behind.
 
-            def _is_award_empty(val) -> bool:
-                if pd.isna(val):
-                    return True
+    Args:
+        cache (dict[int, dict[str, int]]): The award data by NBA ID.
+        path (pathlib.Path): Path to the JSON cache file. Defaults to `AWARDS_CACHE_PATH`.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({str(nba_id): award_data for nba_id, award_data in sorted(cache.items())}, f, ensure_ascii=False)
+
+        pathlib.Path(tmp_path).replace(path)
+    except BaseException:
+        pathlib.Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+async def _fetch_awards(
+    client: httpx.AsyncClient,
+    nba_ids: list[int],
+    cache: dict[int, dict[str, int]],
+    *,
+    refresh: bool = False,
+) -> tuple[dict[int, dict[str, int]], list[tuple[int, httpx.HTTPError]]]:
+    """
+    Fetches award data for many players concurrently, reusing cached results.
 
-                if isinstance(val, dict | list):
-                    return len(val) == 0
+    Args:
+        client (httpx.AsyncClient): The shared client used to query the NBA stats API.
+        nba_ids (list[int]): The NBA IDs of the players to fetch.
+        cache (dict[int, dict[str, int]]): Award data by NBA ID; updated in place with every successful
+            fetch that returned at least one award.
+        refresh (bool): If True, ignore cached entries and fetch every player again. Defaults to False.
 
-                if isinstance(val, str):
-                    s = val.strip()
-                    if not s or s.lower() == "nan":
-                        return True
-                    try:
-                        parsed = json.loads(s)
+    Returns:
+        tuple: The award data by NBA ID for every successful lookup, and the
+            `(nba_id, error)` pairs for the lookups that failed.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONNECTIONS)
+
+    async def _fetch(nba_id: int) -> dict[str, int] | httpx.HTTPError:
+        if not refresh and nba_id in cache:
+            return cache[nba_id]
+
+        async with semaphore:
+            try:
+                award_data = await get_award_data(client, nba_id)
+            except httpx.HTTPError as e:
+                return e
 
-                        if isinstance(parsed, dict | list) and len(parsed) == 0:
-                            return True
+        # Don't cache "no awards yet": an active player may win their first one later
+        if award_data:
+            cache[nba_id] = award_data
+        else:
+            cache.pop(nba_id, None)
+
+        return award_data
 
-                    except Exception:
-                        # not JSON, assume it's a non-empty string representation
-                        return False
+    results = await tqdm_asyncio.gather(*(_fetch(nba_id) for nba_id in nba_ids), leave=False)
 
-                return False
+    award_map: dict[int, dict[str, int]] = {}
+    errors: list[tuple[int, httpx.HTTPError]] = []
 
-            mask_empty_awards = curr_df["awards"].apply(_is_award_empty)
+    for nba_id, result in zip(nba_ids, results, strict=True):
+        if isinstance(result, httpx.HTTPError):
+            errors.append((nba_id, result))
         else:
-            # Either there is no `awards` column yet, or `force` is True;
-            # in both cases we want to attempt fetching awards for all
-            # eligible rows.
-            mask_empty_awards = pd.Series(True, index=curr_df.index)
+            award_map[nba_id] = result
 
-        # Only fetch awards for valid nba_id and YOS > 0 and where awards are empty
-        valid_mask = nba_id_series.notna() & (yos_series != 0) & mask_empty_awards
-        valid_ids = nba_id_series[valid_mask].dropna().unique()
+    return award_map, errors
 
-        award_map: dict[int, dict[str, int]] = {}
 
-        # Fetch award data once per unique NBA ID. If a request times out,
-        # save whatever we've collected so far and exit gracefully.
-        timed_out = False
-        for nba_id in tqdm(valid_ids, leave=False):
-            try:
-                award_data = get_award_data(int(nba_id))
-            except requests.exceptions.Timeout:
-                print(f"Timeout fetching awards for player ID {nba_id}; saving progress and exiting.")
-                timed_out = True
-                break
-            except requests.RequestException as e:
-                # For other request-related errors, surface the issue but
-                # also persist progress so far instead of losing work.
-                print(f"Request error for player ID {nba_id}: {e}; saving progress and exiting.")
-                timed_out = True
-                break
-
-            time.sleep(1)  # be polite to the NBA stats API
-
-            # Log info, but only store entries that actually have award data
-            if not award_data:
-                continue
-
-            award_map[int(nba_id)] = award_data
-
-        # Mask out rows that shouldn't have awards (invalid id or YOS == 0)
-        nba_id_for_map = nba_id_series.where(valid_mask)
-
-        # Map NBA ID -> award dict; only overwrite rows that we intended
-        # to fetch for (either empty awards or force=True).
-        new_awards = nba_id_for_map.map(award_map)
-        if force:
-            curr_df["awards"] = new_awards
+async def _process_team(  # noqa: C901
+    client: httpx.AsyncClient,
+    team: str,
+    cache: dict[int, dict[str, int]],
+    *,
+    force: bool,
+    force_all: bool,
+) -> bool:
+    """Fetch and save award data for a single team.
+
+    Args:
+        client (httpx.AsyncClient): The shared client used to query the NBA stats API.
+        team (str): Abbreviation of the team to process.
+        cache (dict[int, dict[str, int]]): Award data by NBA ID shared across teams.
+        force (bool): See `main`.
+        force_all (bool): See `main`.
+
+    Returns:
+        bool: False if a request failed and processing should stop, True otherwise.
+    """
+    curr_df = pd.read_csv(
+        f"frontend/public/data/csv/{team}_enriched.csv",  # pyright: ignore[reportUnknownMemberType]
+        engine="pyarrow",
+    )
+
+    # By default, skip teams that already have an `awards` column.
+    # `force_all=True` overrides and forces processing of such teams.
+    if "awards" in curr_df.columns and not force_all:
+        print(f"Skipping team {team} because 'awards' column exists (use force_all to override)")
+        return True
+
+    # Normalize types
+    nba_id_series = pd.to_numeric(curr_df["nba_id"], errors="coerce").astype("Int64")
+    yos_series = pd.to_numeric(curr_df["YOS"], errors="coerce").fillna(0).astype("Int64")
+
+    # Determine which rows actually need award data fetched.
+    # If `force` is True, fetch for all eligible rows. Otherwise only
+    # fetch for rows where the `awards` column is empty/missing.
+    if "awards" in curr_df.columns and not force:
+
+        def _is_award_empty(val) -> bool:
+            if pd.isna(val):
+                return True
+
+            if isinstance(val, dict | list):
+                return len(val) == 0
+
+            if isinstance(val, str):
+                s = val.strip()
+                if not s or s.lower() == "nan":
+                    return True
+                try:
+                    parsed = json.loads(s)
+
+                    if isinstance(parsed, dict | list) and len(parsed) == 0:
+                        return True
+
+                except Exception:
+                    # not JSON, assume it's a non-empty string representation
+                    return False
+
+            return False
+
+        mask_empty_awards = curr_df["awards"].apply(_is_award_empty)
+    else:
+        # Either there is no `awards` column yet, or `force` is True;
+        # in both cases we want to attempt fetching awards for all
+        # eligible rows.
+        mask_empty_awards = pd.Series(True, index=curr_df.index)
+
+    # Only fetch awards for valid nba_id and YOS > 0 and where awards are empty
+    valid_mask = nba_id_series.notna() & (yos_series != 0) & mask_empty_awards
+    valid_ids = nba_id_series[valid_mask].dropna().unique()
+
+    # Fetch award data once per unique NBA ID, all at once over the shared
+    # client. If any request fails, save whatever we've collected so far
+    # and exit gracefully.
+    award_map, errors = await _fetch_awards(client, [int(nba_id) for nba_id in valid_ids], cache, refresh=force)
+
+    for nba_id, e in errors:
+        if isinstance(e, httpx.TimeoutException):
+            print(f"Timeout fetching awards for player ID {nba_id}; saving progress and exiting.")
         else:
-            curr_df.loc[mask_empty_awards, "awards"] = new_awards[mask_empty_awards]
-
-        # Save / inspect
-        curr_df.to_csv(f"frontend/public/data/csv/{team}_enriched.csv", index=False)
-        print(f"Fetched awards for team: {team}")
-        if timed_out:
-            print("Saved partial results due to timeout/error. Exiting.")
-            return
+            print(f"Request error for player ID {nba_id}: {e}; saving progress and exiting.")
+
+    timed_out = bool(errors)
+
+    # Only store entries that actually have award data
+    award_map = {nba_id: award_data for nba_id, award_data in award_map.items() if award_data}
+
+    # Mask out rows that shouldn't have awards (invalid id or YOS == 0)
+    nba_id_for_map = nba_id_series.where(valid_mask)
+
+    # Map NBA ID -> award dict; only overwrite rows that we intended
+    # to fetch for (either empty awards or force=True).
+    new_awards = nba_id_for_map.map(award_map)
+    if force or "awards" not in curr_df.columns:
+        curr_df["awards"] = new_awards
+    else:
+        # Build the column in one vectorized pass rather than a masked `.loc` write, which
+        # would also fail to put dicts into a column read back as strings
+        curr_df["awards"] = new_awards.where(mask_empty_awards, curr_df["awards"])
+
+    # Arrow can't write dicts as CSV text, so store awards as their Python repr, like `to_csv` did
+    curr_df["awards"] = curr_df["awards"].map(lambda awards: str(awards) if isinstance(awards, dict) else awards)
+
+    # Save / inspect
+    write_csv(curr_df, f"frontend/public/data/csv/{team}_enriched.csv")
+    print(f"Fetched awards for team: {team}")
+    if timed_out:
+        print("Saved partial results due to timeout/error. Exiting.")
+        return False
+
+    return True
+
+
+async def _run(teams: list[str], cache: dict[int, dict[str, int]], *, force: bool, force_all: bool) -> None:
+    """Enrich every team's CSV with award data using a single shared HTTP/2 client.
+
+    Args:
+        teams (list[str]): Abbreviations of the teams to process.
+        cache (dict[int, dict[str, int]]): Award data by NBA ID, saved back to disk after every team.
+        force (bool): See `main`.
+        force_all (bool): See `main`.
+    """
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=HEADERS,
+        timeout=10,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+    ) as client:
+        for team in tqdm(teams):
+            keep_going = await _process_team(client, team, cache, force=force, force_all=force_all)
+
+            # Persist after every team so progress survives an early exit
+            save_award_cache(cache)
+
+            if not keep_going:
+                return
+
+
+def main(*, force: bool = False, force_all: bool = False) -> None:
+    """Main function to enrich player data with award information.
+
+    Args:
+        force (bool): If True, fetch award data for all eligible players in a
+            team even if an `awards` value already exists for that player,
+            bypassing (and refreshing) the on-disk award cache.
+            Defaults to False.
+        force_all (bool): If True, process teams even when the CSV already
+            contains an `awards` column. When False (default), teams that
+            already have an `awards` column are skipped entirely.
+    """
+    with pathlib.Path("data/teams.json").open("r", encoding="utf-8") as f:
+        teams = json.load(f)
+
+    asyncio.run(_run(teams, load_award_cache(), force=force, force_all=force_all))
 
 
 if __name__ == "__main__":
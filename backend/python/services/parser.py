@@ -1,4 +1,5 @@
-import pathlib  # noqa: CPY001, D100
+import hashlib  # noqa: CPY001, D100
+import pathlib
 from io import StringIO
 
 import pandas as pd
@@ -12,6 +13,38 @@ ALIAS_MAP = {
 }
 
 
+def _read_html_table(html_path: pathlib.Path) -> pd.DataFrame:
+    """
+    Reads the draft table from a team's HTML file, reusing a Parquet snapshot while the HTML is unchanged.
+
+    The snapshot is stored next to the HTML file as `{team}.parquet`, along with a `{team}.parquet.meta`
+    file holding the SHA-256 digest of the HTML it was parsed from.
+
+    Args:
+        html_path (pathlib.Path): Path to the team's HTML file.
+
+    Returns:
+        pd.DataFrame: The draft table parsed from the HTML.
+    """
+    cache_path = html_path.with_suffix(".parquet")
+    meta_path = html_path.with_suffix(".parquet.meta")
+
+    with html_path.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+
+    if cache_path.exists() and meta_path.exists() and meta_path.read_text(encoding="utf-8").strip() == digest:
+        return pd.read_parquet(cache_path)
+
+    # Pin the C-backed lxml parser; without a flavor pandas may fall back to BeautifulSoup/html5lib
+    with html_path.open() as f:
+        df = pd.read_html(StringIO(f.read()), flavor="lxml")[1]  # pyright: ignore[reportUnknownMemberType]
+
+    df.to_parquet(cache_path, index=False)
+    meta_path.write_text(digest, encoding="utf-8")
+
+    return df
+
+
 def load_team_data(team_name: str, *, data_path: str = "data/") -> pd.DataFrame:
     html_path = pathlib.Path(f"{data_path}html/{team_name}.html")
     csv_path = pathlib.Path(f"{data_path}csv/{team_name}.csv")
@@ -22,12 +55,11 @@ def load_team_data(team_name: str, *, data_path: str = "data/") -> pd.DataFrame:
     if not csv_path.exists():
         raise FileNotFoundError(f"The file {csv_path} does not exist.")
 
-    with html_path.open() as f:
-        html_data = pd.read_html(StringIO(f.read()))  # pyright: ignore[reportUnknownMemberType]
+    html_df = _read_html_table(html_path)
 
     csv_df = pd.read_csv(csv_path)
 
-    df = pd.concat((html_data[1], csv_df))
+    df = pd.concat((html_df, csv_df))
 
     # Replace aliases on Draft Trades column
     for alias, actual in ALIAS_MAP.items():
@@ -1,140 +1,188 @@
-import json  # noqa: CPY001, D100
+import asyncio  # noqa: CPY001, D100
+import json
 import pathlib
-import time
+import re
 
+import httpx
 import pandas as pd
-from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC  # noqa: N812
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-
-
-def scrape_draft_history(
-    team_abbreviation: str, team_name: str, team_id: int, save_to: str = "data/csv",
-) -> pd.DataFrame:
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+from backend.python.services.csv_writer import write_csv
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+}
+
+# Header cell that tells the draft history table apart from the other tables on the page
+DRAFT_TABLE_MARKER = "Draft Trades"
+
+# Most pages a team's draft history is split into, the same cap the browser crawler used
+MAX_PAGES = 6
+
+# Teams scraped at once; like the browser crawler's pauses, this keeps RealGM from flagging the crawler as a bot
+MAX_CONCURRENT_TEAMS = 4
+
+# Line breaks and runs of whitespace inside a cell, collapsed the same way `pd.read_html` does
+_WHITESPACE_RE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _cell_text(cell: LexborNode) -> str:
+    """
+    Get the text of a table cell, cleaned up like `pd.read_html` does.
+
+    Args:
+        cell (LexborNode): The `td` or `th` node.
+
+    Returns:
+        str: The cell's text.
+    """
+    return _WHITESPACE_RE.sub(" ", cell.text().strip())
+
+
+def _parse_draft_table(html: str) -> pd.DataFrame | None:
+    """
+    Parse the draft history table out of a RealGM team page.
+
+    Args:
+        html (str): The page's HTML.
+
+    Returns:
+        pd.DataFrame | None: The table's rows, or None if the page has no draft history table.
+    """
+    for table in LexborHTMLParser(html).css("table"):
+        columns = [_cell_text(th) for th in table.css("thead th")]
+
+        if DRAFT_TABLE_MARKER not in columns:
+            continue
+
+        rows = [[_cell_text(td) for td in tr.css("td")] for tr in table.css("tbody tr")]
+        df = pd.DataFrame([row for row in rows if len(row) == len(columns)], columns=columns).replace("", None)
+
+        # Give numeric columns numeric dtypes, as `pd.read_html` would
+        for column in df.columns:
+            numeric = pd.to_numeric(df[column], errors="coerce")
+
+            if numeric.notna().sum() == df[column].notna().sum():
+                df[column] = numeric
+
+        return df
+
+    return None
+
+
+def _save_draft_history(all_data: pd.DataFrame, output_file: pathlib.Path) -> bool:
+    """
+    Save a team's draft history, unless it has fewer rows than the CSV it would replace.
+
+    Args:
+        all_data (pd.DataFrame): The scraped draft history.
+        output_file (pathlib.Path): The team's CSV file.
+
+    Returns:
+        bool: Whether the CSV was written.
+    """
+    # A truncated scrape (e.g. a page that failed to paginate) must not overwrite the existing crawler data
+    if output_file.exists() and len(all_data) < (existing_rows := len(pd.read_csv(output_file))):
+        print(f"Scraped {len(all_data)} rows but {output_file} has {existing_rows}; keeping the existing CSV")
+        return False
+
+    write_csv(all_data, output_file)
+    return True
+
+
+async def scrape_draft_history(
+    client: httpx.AsyncClient, team_abbreviation: str, team_name: str, team_id: int, save_to: str = "data/csv",
+) -> pd.DataFrame | None:
     """
     Scrape draft history data for a given NBA team from RealGM.
 
     Args:
+        client (httpx.AsyncClient): The shared client used to fetch RealGM pages.
         team_abbreviation (str): Abbreviation of the NBA team (e.g., "BOS" for Boston Celtics)
         team_name (str): Name of the NBA team (e.g., "Boston-Celtics")
         team_id (int): ID of the NBA team (e.g., 9 for Boston Celtics)
-        save_to (str): Directory to save the HTML files. Defaults to "data/html".
+        save_to (str): Directory to save the CSV files. Defaults to "data/csv".
 
     Returns:
-        pd.DataFrame: DataFrame containing the draft history data.
+        pd.DataFrame | None: DataFrame containing the draft history data, or None if scraping failed.
     """
-    # Setup Chrome options for better stability
-    chrome_options = Options()
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)  # noqa: FBT003
-
-    # Initialize the Chrome driver with webdriver-manager
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-
-    try:
-        # Navigate to the page
-        url = f"https://basketball.realgm.com/nba/teams/{team_name.replace(" ", "-")}/{team_id}/Draft-History"
-        print(f"Accessing: {url}")
-        driver.get(url)
-
-        # Wait for page to load
-        wait = WebDriverWait(driver, 10)
-
-        # Remove the ad element if it exists
+    url = f"https://basketball.realgm.com/nba/teams/{team_name.replace(" ", "-")}/{team_id}/Draft-History"
+    print(f"Accessing: {url}")
+
+    # Collect each page's table; the de-duplicated row count shows when a page stops adding new picks
+    frames: list[pd.DataFrame] = []
+    collected_rows = 0
+
+    for page in range(1, MAX_PAGES + 1):
         try:
-            ad_element = driver.find_element(By.CSS_SELECTOR, "#AdThrive_Footer_1_desktop")
-            driver.execute_script("arguments[0].remove();", ad_element)
-            print("Ad element removed successfully")
-        except NoSuchElementException:
-            print("Ad element not found, continuing...")
-
-        # Initialize empty dataframe to store all data
-        all_data = pd.DataFrame()
-
-        # Define the table selector
-        table_selector = "#site-takeover > div.main-container > div > div.interior-page > div:nth-child(4) > div.fixed-table-container > div.fixed-table-body > table"
-
-        # Define the next button selector
-        next_button_selector = "#site-takeover > div.main-container > div > div.interior-page > div:nth-child(4) > div.fixed-table-pagination > div.float-right.pagination > ul > li.page-item.page-next > a"
-
-        # Parse initial table
-        print("Parsing page 1...")
-        table_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, table_selector)))
-        table_html = table_element.get_attribute("outerHTML")
-        df = pd.read_html(table_html)[0]
-        all_data = pd.concat([all_data, df], ignore_index=True)
-        print(f"Added {len(df)} rows from page 1")
-
-        # Loop through next 5 pages TODO: Make this dynamic
-        for page_num in range(2, 7):  # Pages 2-6
-            try:
-                # Wait a bit to avoid being detected as a bot
-                time.sleep(1)
-
-                # Click the next button
-                next_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_button_selector)))
-                driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                time.sleep(0.5)  # Small pause after scrolling
-                next_button.click()
-
-                print(f"Parsing page {page_num}...")
-
-                # Wait for the table to update (you might need to adjust this)
-                time.sleep(2)
-
-                # Parse the table again
-                table_element = driver.find_element(By.CSS_SELECTOR, table_selector)
-                table_html = table_element.get_attribute("outerHTML")
-                df = pd.read_html(table_html)[0]
-                all_data = pd.concat([all_data, df], ignore_index=True)
-                print(f"Added {len(df)} rows from page {page_num}")
-
-            except TimeoutException:
-                print(f"Could not find next button on page {page_num - 1}, stopping pagination")
-                break
-            except Exception as e:
-                print(f"Error on page {page_num}: {e!s}")
-                break
-
-        # Clean up the dataframe (remove duplicates if any)
-        all_data = all_data.drop_duplicates().reset_index(drop=True)
-
-        print("\nScraping completed successfully!")
-        print(f"Total rows collected: {len(all_data)}")
-        print(f"Columns: {list(all_data.columns)}")
-
-        # Save to CSV
-        output_file = pathlib.Path(save_to) / f"{team_abbreviation.upper()}.csv"
-        all_data.to_csv(output_file, index=False)
-        print(f"\nData saved to {output_file}")
-
-        return all_data
-
-    except Exception as e:
-        print(f"An error occurred: {e!s}")
+            response = await client.get(url, params={"pageNo": page})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"An error occurred for {team_abbreviation} on page {page}: {e!s}")
+            return None
+
+        df = _parse_draft_table(response.text)
+
+        # Past the last page there is either no table, an empty one, or a repeat of rows already collected
+        if df is None or df.empty:
+            break
+
+        frames.append(df)
+        all_data = pd.concat(frames, ignore_index=True).drop_duplicates().reset_index(drop=True)
+
+        if len(all_data) == collected_rows:
+            break
+
+        collected_rows = len(all_data)
+        print(f"Added {len(df)} rows from page {page} for {team_abbreviation}")
+
+    # An empty table body (e.g. rows loaded by script) must not overwrite the existing crawler data
+    if not frames:
+        print(f"No draft history rows found for {team_abbreviation}; keeping the existing CSV")
         return None
 
-    finally:
-        # Close the browser
-        driver.quit()
-        print("\nBrowser closed")
+    print(f"Total rows collected for {team_abbreviation}: {len(all_data)}")
 
+    # Save to CSV
+    output_file = pathlib.Path(save_to) / f"{team_abbreviation.upper()}.csv"
 
-if __name__ == "__main__":
+    if not await asyncio.to_thread(_save_draft_history, all_data, output_file):
+        return None
+
+    print(f"Data saved to {output_file}")
+
+    return all_data
+
+
+async def scrape_all(team_mapping: dict[str, list]) -> None:
+    """
+    Scrape the draft history of every team concurrently, a few teams at a time.
+
+    Args:
+        team_mapping (dict[str, list]): Team name and RealGM ID by team abbreviation.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TEAMS)
+
+    async def scrape_team(team_abbreviation: str, team_name: str, team_id: int) -> None:
+        async with semaphore:
+            await scrape_draft_history(client, team_abbreviation, team_name, team_id)
+
+    async with httpx.AsyncClient(headers=HEADERS, timeout=30, follow_redirects=True) as client:
+        await asyncio.gather(
+            *(
+                scrape_team(team_abbreviation, team_name, team_id)
+                for team_abbreviation, (team_name, team_id) in team_mapping.items()
+            ),
+        )
+
+
+def main() -> None:
+    """Scrape the draft history of every team listed in `data/teams_mapping.json`."""
     with pathlib.Path("data/teams_mapping.json").open("r", encoding="utf-8") as f:
         team_mapping = json.load(f)
 
-    for team_abbreviation, (team_name, team_id) in team_mapping.items():
-        print(f"\nScraping draft history for {team_abbreviation}...")
-        scrape_draft_history(team_abbreviation, team_name, team_id)
+    asyncio.run(scrape_all(team_mapping))
+
+
+if __name__ == "__main__":
+    main()